@@ -11,13 +11,31 @@ CONFIG = Config(
 )
 
 
+def _config_args(
+    endianness: Endianness,
+    padding_pattern: bytes,
+    padding_check: bool,
+    repeat_fill: bool,
+) -> dict:
+    args = {}
+    if endianness is not None:
+        args["endianness"] = endianness
+    if padding_pattern is not None:
+        args["padding_pattern"] = padding_pattern
+    if padding_check is not None:
+        args["padding_check"] = padding_check
+    if repeat_fill is not None:
+        args["repeat_fill"] = repeat_fill
+    return args
+
+
 def datastruct_config(
     endianness: Endianness = None,
     padding_pattern: bytes = None,
     padding_check: bool = None,
     repeat_fill: bool = None,
 ):
-    args = {k: v for k, v in locals().items() if v is not None}
+    args = _config_args(endianness, padding_pattern, padding_check, repeat_fill)
     CONFIG.update(args)
 
 
@@ -31,7 +49,7 @@ def datastruct(
     padding_check: bool = None,
     repeat_fill: bool = None,
 ):
-    args = {k: v for k, v in locals().items() if v is not None}
+    args = _config_args(endianness, padding_pattern, padding_check, repeat_fill)
 
     def wrap(cls):
         setattr(cls, "_CONFIG", args)
@@ -324,13 +324,15 @@ def bitfield(
         )
     if not is_dataclass(cls):
         raise TypeError("'cls' must be a dataclass")
-    size = bitstruct.calcsize(fmt) // 8
+    # parse the format once, not on every pack/unpack
+    compiled = bitstruct.compile(fmt)
+    size = compiled.calcsize() // 8
     if isinstance(default, int):
         default = default.to_bytes(length=size, byteorder="little")
 
     def encode(value: T, *_) -> bytes:
         data = dataclasses.astuple(value)
-        packed = bitstruct.pack(fmt, *data)
+        packed = compiled.pack(*data)
         if byteswap:
             return bitstruct.byteswap(byteswap, packed)
         return packed
@@ -338,7 +340,7 @@ def bitfield(
     def decode(value: bytes, *_) -> T:
         if byteswap:
             value = bitstruct.byteswap(byteswap, value)
-        data = bitstruct.unpack(fmt, value)
+        data = compiled.unpack(value)
         return cls(*data)
 
     return adapter(encode=encode, decode=decode)(
@@ -3,6 +3,7 @@
 import dataclasses
 import struct
 from dataclasses import MISSING, Field, dataclass
+from enum import Enum
 from functools import lru_cache
 from io import BytesIO
 from typing import IO, Any, Dict, List, Optional, Sized, Tuple, Type, TypeVar, Union
@@ -28,11 +29,14 @@ from .utils.fields import (
     field_get_padding,
     field_switch_base,
 )
-from .utils.fmt import fmt_evaluate
+from .utils.fmt import fmt_evaluate_struct, fmt_repeat_struct
 from .utils.misc import SizingIO
-from .utils.types import ARRAYS, BYTES, EXCEPTIONS, check_value_type
+from .utils.types import ANY_TYPE, ARRAYS, BYTES, EXCEPTIONS, check_value_type
 from .utils.validation import field_validate
 
+# combined Struct, field names, lengths of bytes fields (None for other fields)
+StaticLayout = Tuple[struct.Struct, Tuple[str, ...], Tuple[Optional[int], ...]]
+
 
 @dataclass
 class DataStruct:
@@ -49,7 +53,7 @@ class DataStruct:
             if value != Ellipsis:
                 # correct types of simple default values
                 # (enums, fields with adapters, etc.)
-                if meta.types != ():  # not Any
+                if meta.types is not ANY_TYPE:
                     if isinstance(meta.types, type):
                         value = field_decode(value, meta.types)
                     if not check_value_type(value, meta.types):
@@ -93,15 +97,17 @@ class DataStruct:
             value.pack(io=ctx.G.io, parent=ctx, **kwargs)
             return
         # evaluate and validate the format
-        fmt = fmt_evaluate(ctx, meta.fmt, self.config().endianness)
-        if isinstance(fmt, int) and isinstance(value, bytes):
+        fmt = fmt_evaluate_struct(ctx, meta.fmt, self.config().endianness)
+        if isinstance(fmt, int):
+            if not isinstance(value, bytes):
+                raise TypeError(f"Expected bytes to write, found {type(value)}")
             if len(value) < fmt:
                 raise ValueError(f"Not enough bytes to write: {len(value)} < {fmt}")
             # assume the field is bytes, write it directly
             ctx_write(ctx, value[:fmt])
             return
-        # use struct.pack() to write the raw value
-        ctx_write(ctx, struct.pack(fmt, value))
+        # use Struct.pack() to write the raw value
+        ctx_write(ctx, fmt.pack(value))
 
     def _sizeof_value(self, ctx: Context, meta: FieldMeta, value: Any) -> None:
         # size structures directly
@@ -110,13 +116,13 @@ class DataStruct:
             value.pack(io=ctx.G.io, parent=ctx, **kwargs)
             return
         # evaluate and validate the format
-        fmt = fmt_evaluate(ctx, meta.fmt, self.config().endianness)
+        fmt = fmt_evaluate_struct(ctx, meta.fmt, self.config().endianness)
         if isinstance(fmt, int):
             # assume the field is bytes, size it directly
             ctx.G.io.write(fmt)
             return
-        # use struct.calcsize() to calculate size of the raw value
-        ctx.G.io.write(struct.calcsize(fmt))
+        # use the precompiled Struct to get size of the raw value
+        ctx.G.io.write(fmt.size)
 
     def _write_field(
         self,
@@ -261,6 +267,103 @@ class DataStruct:
                 value = field_get_default(field, meta, DataStruct)
             return self._write_field(ctx, field, meta, value)
 
+    @classmethod
+    @lru_cache()
+    def _static_layout(cls) -> Optional[StaticLayout]:
+        # find structures made only of plain field()s with constant formats,
+        # which can be packed using a single struct.Struct
+        endianness = cls.config().endianness
+        prefix = None
+        spec = ""
+        names = []
+        lengths = []
+        for field, meta in cls.classfields():
+            if meta.ftype != FieldType.FIELD or not meta.public:
+                return None
+            if meta.builder or meta.adapter or meta.fmt is None or callable(meta.fmt):
+                return None
+            try:
+                field_validate(field, meta)
+                fmt = fmt_evaluate_struct(None, meta.fmt, endianness)
+            except EXCEPTIONS:
+                return None
+            if isinstance(fmt, int):
+                # bytes field
+                spec += f"{fmt}s"
+                lengths.append(fmt)
+            else:
+                # native alignment would change offsets of the combined struct
+                if fmt.format[0] == "@" or prefix not in (None, fmt.format[0]):
+                    return None
+                # only single-value formats (no "2I", "x", etc.)
+                if len(fmt.unpack(bytes(fmt.size))) != 1:
+                    return None
+                prefix = fmt.format[0]
+                spec += fmt.format[1:]
+                lengths.append(None)
+            names.append(field.name)
+        if not names:
+            return None
+        packer = struct.Struct((prefix or endianness.value) + spec)
+        return packer, tuple(names), tuple(lengths)
+
+    def _write_static(self, ctx: Context, layout: StaticLayout) -> bool:
+        packer, names, lengths = layout
+        if ctx.G.sizing:
+            ctx.G.io.write(packer.size)
+            return True
+        if ctx.G.hooks:
+            # let hooks see each field separately
+            return False
+        values = []
+        for name, length in zip(names, lengths):
+            value = field_encode(getattr(self, name))
+            if length is not None and (
+                not isinstance(value, bytes) or len(value) < length
+            ):
+                return False
+            values.append(value)
+        try:
+            data = packer.pack(*values)
+        except EXCEPTIONS:
+            # use the standard path to report the error
+            return False
+        ctx_write(ctx, data)
+        return True
+
+    @classmethod
+    def _read_static(cls, ctx: Context, layout: StaticLayout) -> None:
+        packer, _, _ = layout
+        data = ctx_read(ctx, packer.size)
+        values = ctx.self
+        field_name = cls.__name__
+        try:
+            if len(data) < packer.size:
+                # find the first field that can't be read completely
+                endianness = cls.config().endianness
+                offset = 0
+                for field, meta in cls.classfields():
+                    field_name = f"{cls.__name__}.{field.name}"
+                    fmt = fmt_evaluate_struct(ctx, meta.fmt, endianness)
+                    if isinstance(fmt, int):
+                        available = len(data) - offset
+                        if available < fmt:
+                            raise ValueError(
+                                f"Not enough bytes to read: {available} < {fmt}"
+                            )
+                        offset += fmt
+                    else:
+                        # raises struct.error if too short, as in _read_value()
+                        fmt.unpack(data[offset : offset + fmt.size])
+                        offset += fmt.size
+            for (field, meta), value in zip(cls.classfields(), packer.unpack(data)):
+                field_name = f"{cls.__name__}.{field.name}"
+                values[field.name] = field_decode(value, meta.types)
+        except EXCEPTIONS as e:
+            suffix = f"; while unpacking '{field_name}'"
+            e.args = (e.args[0] + suffix,)
+            raise e
+
     @classmethod
     def _read_value(cls, ctx: Context, meta: FieldMeta, typ: Type[T]) -> T:
         # unpack structures directly
@@ -268,18 +371,50 @@ class DataStruct:
             kwargs = {k: evaluate(ctx, v) for k, v in meta.kwargs.items()}
             return typ.unpack(io=ctx.G.io, parent=ctx, **kwargs)
         # evaluate and validate the format
-        fmt = fmt_evaluate(ctx, meta.fmt, cls.config().endianness)
+        fmt = fmt_evaluate_struct(ctx, meta.fmt, cls.config().endianness)
         if isinstance(fmt, int):
             # assume the field is bytes, write it directly
             value = ctx_read(ctx, fmt)
             if len(value) < fmt:
                 raise ValueError(f"Not enough bytes to read: {len(value)} < {fmt}")
             return value
-        # use struct.unpack() to read the raw value
-        length = struct.calcsize(fmt)
-        (value,) = struct.unpack(fmt, ctx_read(ctx, length))
+        # use Struct.unpack() to read the raw value
+        (value,) = fmt.unpack(ctx_read(ctx, fmt.size))
         return value
 
+    @classmethod
+    def _read_repeat_static(
+        cls,
+        ctx: Context,
+        meta: FieldMeta,
+        count: int,
+    ) -> Optional[list]:
+        # read a fixed number of simple values using a single struct.Struct
+        if meta.ftype != FieldType.FIELD or meta.adapter or callable(meta.fmt):
+            return None
+        if not isinstance(meta.types, type) or issubclass(meta.types, DataStruct):
+            return None
+        fmt = fmt_evaluate_struct(ctx, meta.fmt, cls.config().endianness)
+        if isinstance(fmt, int):
+            return None
+        item = fmt
+        fmt = fmt_repeat_struct(item, count)
+        if fmt is None:
+            return None
+        data = ctx_read(ctx, fmt.size)
+        is_enum = issubclass(meta.types, Enum)
+        if len(data) < fmt.size:
+            # fail on the first incomplete item, like the per-field path
+            end = len(data) - len(data) % item.size
+            if is_enum:
+                for (value,) in item.iter_unpack(data[:end]):
+                    field_decode(value, meta.types)
+            item.unpack(data[end:])
+        values = fmt.unpack(data)
+        if is_enum:
+            return [field_decode(value, meta.types) for value in values]
+        return list(values)
+
     @classmethod
     def _read_field(
         cls,
@@ -302,7 +437,9 @@ class DataStruct:
 
         if meta.ftype == FieldType.PADDING:
             length, padding, check = field_get_padding(cls.config(), ctx, meta)
-            if ctx_read(ctx, length) != padding and check:
+            # read it anyway, to keep IO hooks and non-seekable streams in step
+            data = ctx_read(ctx, length)
+            if check and data != padding:
                 raise ValueError(f"Invalid padding found")
             return Ellipsis
 
@@ -323,6 +460,17 @@ class DataStruct:
             length = evaluate(ctx, meta.length)
             end = length and (ctx.P.tell() + length)
             base_field, base_meta = field_get_base(meta)
+            if (
+                isinstance(count, int)
+                and count > 0
+                and end is None
+                and meta.when is None
+                and meta.last is None
+                and not ctx.G.hooks
+            ):
+                items = cls._read_repeat_static(ctx, base_meta, count)
+                if items is not None:
+                    return items
             items = []
 
             while (count is None or i < count) and (end is None or ctx.P.tell() < end):
@@ -384,7 +532,6 @@ class DataStruct:
         if isinstance(field_names, str):
             field_names = [field_names]
 
-        fields = self.fields()
         ctx = build_context(glob, parent, self.config(), **kwargs)
         ctx.self = self
         if ctx_out is not None:
@@ -394,6 +541,12 @@ class DataStruct:
         field_name = type(self).__name__
         try:
             field_found = not field_names
+            # write structures with a fixed layout at once
+            layout = not field_names and self._static_layout()
+            if layout and self._write_static(ctx, layout):
+                fields = []
+            else:
+                fields = self.fields()
             for field, meta, _ in fields:
                 if field_names and field.name not in field_names:
                     continue
@@ -442,6 +595,11 @@ class DataStruct:
         ctx.self = values
         if ctx_out is not None:
             ctx_out.append(ctx)
+        # read structures with a fixed layout at once
+        layout = not ctx.G.hooks and cls._static_layout()
+        if layout:
+            cls._read_static(ctx, layout)
+            fields = ()
         field_name = cls.__name__
         try:
             for field, meta in fields:
@@ -483,21 +641,27 @@ class DataStruct:
         return [
             (
                 field,
-                field_get_meta(field),
+                meta,
                 self.__getattribute__(field.name),
             )
-            for field in dataclasses.fields(self)
+            for field, meta in self._field_metas()
         ]
 
     @classmethod
     def classfields(cls) -> List[Tuple[Field, FieldMeta]]:
-        return [
+        return list(cls._field_metas())
+
+    @classmethod
+    @lru_cache()
+    def _field_metas(cls) -> Tuple[Tuple[Field, FieldMeta], ...]:
+        # fields of a class don't change - look them up only once
+        return tuple(
             (
                 field,
                 field_get_meta(field),
             )
             for field in dataclasses.fields(cls)
-        ]
+        )
 
     def asdict(self) -> Dict[str, Any]:
         return dataclasses.asdict(self)
@@ -513,7 +677,29 @@ class DataStruct:
 DS = TypeVar("DS", bound=DataStruct)
 
 
+def _sizeof_items(o, ctx: Optional[Context]) -> int:
+    return sum(i.sizeof(parent=ctx) for i in o)
+
+
+def _sizeof_sized(o, ctx: Optional[Context]) -> int:
+    return len(o)
+
+
+# handlers for the most common exact types, to skip the isinstance() checks
+_SIZEOF_DISPATCH = {
+    list: _sizeof_items,
+    tuple: _sizeof_items,
+    bytes: _sizeof_sized,
+    bytearray: _sizeof_sized,
+    memoryview: _sizeof_sized,
+    str: _sizeof_sized,
+}
+
+
 def sizeof(o, ctx: Optional[Context] = None) -> int:
+    handler = _SIZEOF_DISPATCH.get(type(o))
+    if handler:
+        return handler(o, ctx)
     if isinstance(o, DataStruct):
         return o.sizeof(parent=ctx)
     if isinstance(o, ARRAYS):
@@ -21,6 +21,10 @@ def field_encode(v: Any) -> Any:
 
 def field_decode(v: Any, cls: type) -> Any:
     if issubclass(cls, Enum):
+        # look up the member directly, skipping EnumMeta.__call__()
+        member = cls._value2member_map_.get(v)
+        if member is not None:
+            return member
         return cls(v)
     return v
 
@@ -92,6 +96,11 @@ def field_get_padding(
 
 def field_switch_base(config: Config, ctx: Context, meta: FieldMeta) -> Field:
     key = evaluate(ctx, meta.key)
+    fields = meta.fields
+    # most switch() fields are keyed directly by the key value
+    case = fields.get(key)
+    if case is not None:
+        return case[1]
     keys = [key]
     if isinstance(key, int):
         keys.append(f"_{key}")
@@ -100,12 +109,12 @@ def field_switch_base(config: Config, ctx: Context, meta: FieldMeta) -> Field:
     if isinstance(key, Enum):
         keys.append(key.name)
         keys.append(key.value)
-    for key in keys:
-        if key not in meta.fields:
-            continue
-        return meta.fields[key][1]
-    if "default" in meta.fields:
-        return meta.fields["default"][1]
+    for key in keys[1:]:
+        case = fields.get(key)
+        if case is not None:
+            return case[1]
+    if "default" in fields:
+        return fields["default"][1]
     raise ValueError(f"Unmapped field type (and no default=...), tried {keys}")
 
 
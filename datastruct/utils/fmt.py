@@ -1,6 +1,8 @@
 #  Copyright (c) Kuba Szczodrzyński 2023-1-3.
 
-from typing import Union
+import struct
+from functools import lru_cache
+from typing import Optional, Union
 
 from datastruct.types import Context, Endianness, FormatType, Value
 
@@ -8,6 +10,13 @@ from .context import evaluate
 
 FMT_ENDIAN = "@=<>!"
 FMT_SPEC = "cbB?hHiIlLqQnNefds"
+# all valid format specifiers having an optional count of up to 64
+FMT_VALID = frozenset(
+    endian + count + spec
+    for endian in ("", *FMT_ENDIAN)
+    for count in ("", *(str(i) for i in range(1, 65)))
+    for spec in FMT_SPEC
+)
 
 
 def fmt_check(fmt: Value[str]) -> None:
@@ -17,6 +26,8 @@ def fmt_check(fmt: Value[str]) -> None:
     """
     if callable(fmt) or isinstance(fmt, int):
         return
+    if fmt in FMT_VALID:
+        return
     orig_fmt = fmt
     if fmt[0] in FMT_ENDIAN:
         fmt = fmt[1:]
@@ -28,26 +39,63 @@ def fmt_check(fmt: Value[str]) -> None:
         raise ValueError(f"Format specifier '{orig_fmt}' has non-numeric count")
 
 
-def fmt_evaluate(
+def fmt_evaluate_struct(
     ctx: Context,
     fmt_val: FormatType,
     endianness: Endianness,
-) -> Union[str, int]:
+) -> Union[struct.Struct, int]:
     """
-    First evaluate(), then fmt_check() the given format (if it's a lambda).
+    First evaluate(), then fmt_check() the given format (once per unique format).
     Set endianness if not set already.
 
-    :return: a valid format specifier, with endianness applied
+    :return: a compiled format specifier, or length of a bytes field
     """
     fmt = evaluate(ctx, fmt_val)
     if isinstance(fmt, int):
         return fmt
     if not fmt:
         raise ValueError("Field has no format specifier")
-    if callable(fmt_val):
-        fmt_check(fmt)
+    return _compile_fmt(fmt, endianness)
+
+
+def fmt_evaluate(
+    ctx: Context,
+    fmt_val: FormatType,
+    endianness: Endianness,
+) -> Union[str, int]:
+    """
+    Same as fmt_evaluate_struct(), but return the format string.
+    Kept for compatibility; the library itself uses fmt_evaluate_struct().
+
+    :return: a valid format specifier, with endianness applied
+    """
+    fmt = fmt_evaluate_struct(ctx, fmt_val, endianness)
+    if isinstance(fmt, int):
+        return fmt
+    return fmt.format
+
+
+@lru_cache(maxsize=1024)
+def _compile_fmt(fmt: str, endianness: Endianness) -> Union[struct.Struct, int]:
+    # formats are short and repeat a lot - check & compile each one only once
+    fmt_check(fmt)
     if fmt[0] not in FMT_ENDIAN:
         fmt = endianness.value + fmt
-    if fmt[-1] == "s" and fmt[1:-1].isnumeric():
-        return int(fmt[1:-1])
-    return fmt
+    if fmt.endswith("s"):
+        count = fmt[1:-1]
+        if count.isdigit():
+            return int(count)
+    return struct.Struct(fmt)
+
+
+@lru_cache(maxsize=1024)
+def fmt_repeat_struct(fmt: struct.Struct, count: int) -> Optional[struct.Struct]:
+    """
+    Build a struct.Struct reading 'count' values of a single-value format.
+
+    :return: a compiled format specifier, or None if the format is not repeatable
+    """
+    prefix, code = fmt.format[0], fmt.format[1:]
+    if len(code) != 1 or code in "spx":
+        return None
+    return struct.Struct(f"{prefix}{count}{code}")
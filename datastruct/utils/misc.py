@@ -7,22 +7,35 @@ from typing import IO, AnyStr
 
 def repstr(string, length: int):
     # a significantly faster version of https://stackoverflow.com/a/9021522/9438331
-    return (string * (length // len(string) + 1))[0:length]
+    # (allocates exactly 'length' items, without slicing an oversized copy)
+    if len(string) == 1:
+        return string * length
+    count, rest = divmod(length, len(string))
+    return string * count + string[:rest]
 
 
 def pad_up(x: int, n: int) -> int:
     """Return how many bytes of padding is needed to align 'x'
     up to block size of 'n'."""
+    if n > 0 and n & (n - 1) == 0:
+        # power-of-two block size, use a bitmask
+        return -x & (n - 1)
     return (n - (x % n)) % n
 
 
 def dict2str(data: dict) -> str:
-    return ", ".join(f"{k}={v}" for k, v in data.items())
+    return ", ".join(map("{}={}".format, data.keys(), data.values()))
 
 
-class SizingIO(IO[bytes], ABC):
-    pos: int = 0
-    size: int = 0
+class SizingIO(IO[bytes]):
+    __slots__ = ("pos", "size")
+
+    pos: int
+    size: int
+
+    def __init__(self) -> None:
+        self.pos = 0
+        self.size = 0
 
     def tell(self) -> int:
         return self.pos
@@ -41,12 +54,14 @@ class SizingIO(IO[bytes], ABC):
         if not isinstance(s, int):
             s = len(s)
         self.pos += s
-        self.size = max(self.pos, self.size)
+        if self.pos > self.size:
+            self.size = self.pos
         return s
 
     def add(self, n: int):
         self.pos += n
-        self.size = max(self.pos, self.size)
+        if self.pos > self.size:
+            self.size = self.pos
 
 
 class MemoryIO(IO[bytes], ABC):
@@ -2,77 +2,143 @@
 
 import struct
 import typing
+from functools import lru_cache
 from types import UnionType
-from typing import Any, Tuple, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
 ARRAYS = (list, tuple)
 EXCEPTIONS = (ValueError, TypeError, AttributeError, struct.error)
 BYTES = (bytes, bytearray)
 
+
+class _GenericMarker:
+    def __repr__(self) -> str:
+        # shown in error messages that include decoded types
+        return "GENERIC"
+
+
+# marks generic types (GENERIC, cls, args...), as opposed to unions (cls, cls...)
+GENERIC = _GenericMarker()
+# optional types, cond() fields - compared by identity
+NONE_TYPE = type(None)
+# special fields (seek, padding, etc.) - compared by identity
+ELLIPSIS_TYPE = type(Ellipsis)
+# 'Any' is represented as an empty tuple - compared by identity
+ANY_TYPE = ()
+
 FieldTypes = Union[type, Tuple["FieldTypes", ...]]
 
+# decoded types, keyed by id() of the annotation - equality can't be used,
+# because Union[int, str] == Union[str, int], while the order matters for cond();
+# the annotation is stored as well, so that its id() is never reused
+_DECODE_CACHE: Dict[int, Tuple[Any, FieldTypes]] = {}
+# the cache is cleared when full, so that annotations (and classes they refer to)
+# of dynamically created structures can be freed
+_DECODE_CACHE_SIZE = 1024
+
 
 def decode_type(cls: type) -> FieldTypes:
     if isinstance(cls, tuple):
         return cls
+    types = _decode_simple(cls)
+    if types is not None:
+        return types
+    if len(_DECODE_CACHE) >= _DECODE_CACHE_SIZE:
+        _DECODE_CACHE.clear()
+    # decode generics and unions without recursion - process the nested
+    # annotations first (depth-first), then build the outer ones from cache
+    stack = [(cls, False)]
+    while stack:
+        item, args_decoded = stack.pop()
+        if id(item) in _DECODE_CACHE:
+            continue
+        args = typing.get_args(item)
+        if not args_decoded:
+            stack.append((item, True))
+            stack.extend((arg, False) for arg in args if _decode_simple(arg) is None)
+            continue
+        types = _decode_generic(item, tuple(_decode_simple(arg) for arg in args))
+        _DECODE_CACHE[id(item)] = (item, types)
+    return _DECODE_CACHE[id(cls)][1]
+
+
+def _decode_simple(cls: type) -> Optional[FieldTypes]:
+    # decode a non-generic or a cached type; return None for uncached generics
     if cls is None:
         # literal NoneType (e.g. optional fields, cond())
-        return type(None)
+        return NONE_TYPE
     if cls is Ellipsis:
         # special fields only (seek, padding, etc)
-        return type(Ellipsis)
+        return ELLIPSIS_TYPE
     if cls is Any:
         # represent Any as an empty tuple
-        return ()
+        return ANY_TYPE
+    cached = _DECODE_CACHE.get(id(cls))
+    if cached is not None:
+        return cached[1]
     if typing.get_origin(cls):
-        origin: type = typing.get_origin(cls)
-        args = typing.get_args(cls)
-        if origin in [Union, UnionType]:
-            assert len(args) > 1
-            union = tuple(decode_type(cls) for cls in args)
-            if () in union:
-                # found Any, skip all other args
-                return ()
-            return union
-        # 'True' indicates that it's a generic type, not a union
-        return origin, True, *(decode_type(cls) for cls in args)
+        return None
     if cls in ARRAYS:
         # represent non-parameterized lists in the same format
-        return cls, True, ()
+        return GENERIC, cls, ANY_TYPE
+    # plain classes are not cached - they decode to themselves
     return cls
 
 
+def _decode_generic(cls: type, args: Tuple[FieldTypes, ...]) -> FieldTypes:
+    origin: type = typing.get_origin(cls)
+    if origin in (Union, UnionType):
+        assert len(args) > 1
+        if ANY_TYPE in args:
+            # found Any, skip all other args
+            return ANY_TYPE
+        return args
+    # 'GENERIC' indicates that it's a generic type, not a union
+    return GENERIC, origin, *args
+
+
 def check_class_type(cls: type, types: FieldTypes) -> bool:
-    if types == type(Ellipsis):
+    if types is ELLIPSIS_TYPE:
         return True
     if isinstance(types, type):
         return issubclass(cls, types)
-    if types == ():
+    if types is ANY_TYPE:
         return True
-    if True in types:
-        return issubclass(cls, types[0])
-    return any(issubclass(cls, typ) for typ in types)
+    if types[0] is GENERIC:
+        return issubclass(cls, types[1])
+    for typ in types:
+        if isinstance(typ, tuple):
+            # generic union member, e.g. int | list[int]
+            if check_class_type(cls, typ):
+                return True
+        elif issubclass(cls, typ):
+            return True
+    return False
 
 
 def check_value_type(value: object, types: FieldTypes) -> bool:
     return check_class_type(type(value), types)
 
 
+@lru_cache()
 def check_types_match(subtypes: FieldTypes, supertypes: FieldTypes) -> bool:
-    if type(Ellipsis) in [subtypes, supertypes]:
+    if ELLIPSIS_TYPE in (subtypes, supertypes):
         # special case - Ellipsis fields are exempt
         return True
     if isinstance(subtypes, type):
         # simple type
         return check_class_type(subtypes, supertypes)
-    if subtypes == ():
+    if subtypes is ANY_TYPE:
         # 'Any' subtype will only match the 'Any' supertype
-        return supertypes == ()
-    if supertypes == ():
+        return supertypes is ANY_TYPE
+    if supertypes is ANY_TYPE:
         # 'Any' supertype will match any subtype
         return True
-    if True in subtypes:
+    if subtypes[0] is GENERIC:
         # generic subtype
-        return check_class_type(subtypes[0], supertypes)
+        return check_class_type(subtypes[1], supertypes)
     # union type - make sure all subtypes match
-    return all(check_class_type(typ, supertypes) for typ in subtypes)
+    for typ in subtypes:
+        if not check_class_type(typ, supertypes):
+            return False
+    return True
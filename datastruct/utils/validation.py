@@ -2,13 +2,21 @@
 
 from dataclasses import Field, is_dataclass
 from enum import Enum, auto
+from functools import lru_cache
 from types import FunctionType
 
 from datastruct.types import FieldMeta, FieldType
 
 from .fields import field_get_base, field_get_meta
 from .fmt import fmt_check
-from .types import check_types_match, decode_type
+from .types import (
+    ANY_TYPE,
+    ELLIPSIS_TYPE,
+    GENERIC,
+    NONE_TYPE,
+    check_types_match,
+    decode_type,
+)
 
 
 class ValidType(Enum):
@@ -21,13 +29,17 @@ class ValidType(Enum):
 
 UNION_FIELDS = (FieldType.COND, FieldType.SWITCH)
 
+# field types repeat a lot across structs - cache the recent checks (bounded,
+# so that dynamically created classes can be freed)
+_is_dataclass = lru_cache()(is_dataclass)
+
 
 def _validate_ellipsis_usage(meta: FieldMeta) -> bool:
     # process special fields (seek, padding, etc)
     # also: wrapper fields that wrap special fields - except switch()
     # (wrapper fields inherit the 'public' property; switch() doesn't)
     if not meta.public:
-        if meta.types != type(Ellipsis):
+        if meta.types is not ELLIPSIS_TYPE:
             raise TypeError("Use Ellipsis (...) for special fields")
         # wrapped special fields make the wrappers non-public
         # so accept any special fields that aren't wrappers
@@ -38,18 +50,40 @@ def _validate_ellipsis_usage(meta: FieldMeta) -> bool:
             raise TypeError("Only cond() and switch() can wrap special fields")
     # reject public fields with incorrect type
     # (except switch() fields, as they can wrap special fields)
-    elif meta.types == type(Ellipsis) and meta.ftype not in UNION_FIELDS:
+    elif meta.types is ELLIPSIS_TYPE and meta.ftype not in UNION_FIELDS:
         raise TypeError("Cannot use Ellipsis (...) for standard fields")
     return False
 
 
 def _validate_property_type_usage(meta: FieldMeta) -> ValidType:
     # CHECK FIELD VALIDITY DEPENDING ON THE PROPERTY CLASS(ES)
-    is_tuple = isinstance(meta.types, tuple)
+    types = meta.types
+    is_tuple = isinstance(types, tuple)
 
-    # generic type (cls, True, args...) - only allow repeat()
-    if is_tuple and True in meta.types:
-        if meta.types[0] != list:
+    # simple types (primitives, DataStruct, etc.) - most common, check first
+    if not is_tuple and types is not ELLIPSIS_TYPE:
+        # FieldType.FIELD is used for field(), subfield(), built()
+        if not isinstance(types, type):
+            # var: "int" = field(...)
+            raise TypeError(f"Field type must be a class, found {types!r}")
+        if isinstance(None, types):
+            # var: None = field(...)
+            # var: object = field(...)
+            raise TypeError("Cannot use None as field type")
+        if _is_dataclass(types):
+            if meta.fmt is not None and not meta.adapter:
+                # var: DataStruct = field(...)
+                # var: DataStruct = built(...)
+                raise TypeError("Use subfield() for instances of DataStruct")
+        else:
+            if meta.fmt is None and not meta.base and meta.ftype != FieldType.SWITCH:
+                # var: int = subfield()
+                raise TypeError("Use field() for non-DataStruct types")
+        return ValidType.SIMPLE
+
+    # generic type (GENERIC, cls, args...) - only allow repeat()
+    elif is_tuple and types and types[0] is GENERIC:
+        if types[1] != list:
             # var: dict[int, int] = field(...)
             raise TypeError("Unknown generic type; only list[...] is supported")
         if meta.ftype != FieldType.REPEAT:
@@ -58,13 +92,13 @@ def _validate_property_type_usage(meta: FieldMeta) -> ValidType:
         return ValidType.REPEAT
 
     # union type (cls, cls...) - only allow cond() or switch()
-    elif is_tuple and len(meta.types):
+    elif is_tuple and len(types):
         # len(meta.types) >= 2
         if meta.ftype not in UNION_FIELDS:
-            if len(meta.types) > 2:
+            if len(types) > 2:
                 # var: int | float | bytes = field(...)
                 raise TypeError("Use switch() for union of 3 or more types")
-            elif type(None) in meta.types:
+            elif NONE_TYPE in types:
                 # var: DataStruct | None = field(...)
                 raise TypeError("Use cond() for optional types")
             else:
@@ -80,29 +114,12 @@ def _validate_property_type_usage(meta: FieldMeta) -> ValidType:
         return ValidType.ANY
 
     # special type Ellipsis - only allow cond(), switch()
-    elif meta.types == type(Ellipsis):
+    else:
         if meta.ftype not in UNION_FIELDS:
             # var: ... = field(...)
             raise TypeError("The Ellipsis (...) can only be used with switch()/cond()")
         return ValidType.ELLIPSIS
 
-    # simple types (primitives, DataStruct, etc.)
-    else:
-        # FieldType.FIELD is used for field(), subfield(), built()
-        if isinstance(None, meta.types):
-            # var: None = field(...)
-            raise TypeError("Cannot use None as field type")
-        if is_dataclass(meta.types):
-            if meta.fmt is not None and not meta.adapter:
-                # var: DataStruct = field(...)
-                # var: DataStruct = built(...)
-                raise TypeError("Use subfield() for instances of DataStruct")
-        else:
-            if meta.fmt is None and not meta.base and meta.ftype != FieldType.SWITCH:
-                # var: int = subfield()
-                raise TypeError("Use field() for non-DataStruct types")
-        return ValidType.SIMPLE
-
 
 def _validate_field(field: Field, meta: FieldMeta, valid_type: ValidType) -> None:
     # validate format specifiers
@@ -124,20 +141,25 @@ def _validate_repeat(field: Field, meta: FieldMeta, valid_type: ValidType) -> No
         raise TypeError("Lists of standard fields must be parameterized")
     base_field.name = field.name
     # "unwrap" item types for repeat fields only
-    field.type = meta.types[0]
+    field.type = meta.types[1]
     base_field.type = meta.types[2]
-    field_validate(base_field, base_meta)
+    # base fields are validated along with their wrapper, unless already done
+    if not base_meta.validated:
+        field_validate(base_field, base_meta)
 
 
 def _validate_cond(field: Field, meta: FieldMeta, valid_type: ValidType) -> None:
+    # FieldMeta attribute access is slow - read the values once
+    field_types = meta.types
+    if_not = meta.if_not
     if_not_type = None
-    if type(meta.if_not) != FunctionType:
+    if not isinstance(if_not, FunctionType):
         # cannot get 'if_not=' type for lambdas
-        if meta.if_not in [None, Ellipsis]:
+        if if_not is None or if_not is Ellipsis:
             # specified None as default value
-            if_not_type = type(None)
+            if_not_type = NONE_TYPE
         else:
-            if_not_type = type(meta.if_not)
+            if_not_type = type(if_not)
     base_field, base_meta = field_get_base(meta)
     base_field.name = field.name
     if valid_type == ValidType.UNION:
@@ -145,7 +167,7 @@ def _validate_cond(field: Field, meta: FieldMeta, valid_type: ValidType) -> None
         # var: int | None = cond(...)(field(...))
         # -> len(meta.types) >= 2
         # verify that the type is specified for this field
-        if if_not_type and if_not_type not in meta.types:
+        if if_not_type and if_not_type not in field_types:
             # var: int | bool = cond(..., if_not=None)(field(...))
             raise TypeError(
                 f"Type of 'if_not=' ({if_not_type}) must be part of the union"
@@ -154,74 +176,83 @@ def _validate_cond(field: Field, meta: FieldMeta, valid_type: ValidType) -> None
         if base_meta.ftype == FieldType.SWITCH:
             base_field.type = field.type
         # for Union[*, ..., None] - use all non-None types
-        elif type(None) in meta.types:
+        elif NONE_TYPE in field_types:
             # var: int | None = cond(...)(field(...))
-            types = list(meta.types)
-            types.remove(type(None))
-            base_field.type = types[0] if len(types) == 1 else tuple(types)
+            types = tuple(cls for cls in field_types if cls is not NONE_TYPE)
+            base_field.type = types[0] if len(types) == 1 else types
         # for Union[*, *, ...] - try to guess the two types
         else:
             # var: int | bool = cond(...)(field(...))
             if if_not_type:
                 # var: int | bool = cond(..., if_not=False)(field(...))
                 # 'if_not=' has a known type, simply use the other one
-                types = list(meta.types)
-                types.remove(if_not_type)
-                base_field.type = types[0]
+                for cls in field_types:
+                    if cls is not if_not_type:
+                        base_field.type = cls
+                        break
             else:
                 # var: int | bool = cond(..., if_not=lambda ctx: ...)(field(...))
                 # two types - check if any is a DataStruct
-                structs = tuple(is_dataclass(cls) for cls in meta.types)
+                structs = tuple(map(_is_dataclass, field_types))
                 if len(structs) == 2 and structs[0] and not structs[1]:
                     # var: DataStruct | int = cond(..., ...)(subfield(...))
                     # var: DataStruct | int = cond(..., ...)(field(...))
-                    base_field.type = meta.types[0 if base_meta.fmt is None else 1]
+                    base_field.type = field_types[0 if base_meta.fmt is None else 1]
                 elif len(structs) == 2 and structs[1] and not structs[0]:
                     # var: int | DataStruct = cond(..., ...)(subfield(...))
                     # var: int | DataStruct = cond(..., ...)(field(...))
-                    base_field.type = meta.types[1 if base_meta.fmt is None else 0]
+                    base_field.type = field_types[1 if base_meta.fmt is None else 0]
                 else:
                     # var: int | bool = cond(..., ...)(field(...))
                     raise TypeError("Couldn't guess the wrapped field's type")
     elif valid_type == ValidType.ANY:
         # var: Any = cond(...)(field(...))
         # pass empty tuple for validation of the base field
-        base_field.type = ()
+        base_field.type = ANY_TYPE
     elif valid_type == ValidType.ELLIPSIS:
         # var: ... = cond(...)(field(...))
-        # -> meta.types == type(Ellipsis)
+        # -> meta.types is ELLIPSIS_TYPE
         base_field.type = Ellipsis
     elif valid_type == ValidType.SIMPLE:
         # var: int = cond(..., if_not=0)(field(...))
         # -> type(meta.types) == type
-        if if_not_type and if_not_type != meta.types:
+        if if_not_type and if_not_type != field_types:
             # var: int = cond(..., if_not=None)(field(...))
             raise TypeError(
                 f"Type of 'if_not=' ({if_not_type}) different than the field type"
             )
-        base_field.type = meta.types
+        base_field.type = field_types
     else:
         raise TypeError("No valid class/type found for cond()")
-    field_validate(base_field, base_meta)
+    if not base_meta.validated:
+        field_validate(base_field, base_meta)
 
 
 def _validate_switch(field: Field, meta: FieldMeta, valid_type: ValidType) -> None:
+    field_types = meta.types
+    # case types equal to the field type (or one of its union members) always fit
+    exact_types = {field_types}
+    if valid_type == ValidType.UNION:
+        exact_types.update(field_types)
     # test each case of the switch field
     base_types = []
     for key, (field_type, base_field) in meta.fields.items():
         base_type = decode_type(field_type)
-        if not check_types_match(base_type, meta.types):
+        if base_type not in exact_types and not check_types_match(
+            base_type, field_types
+        ):
             # var: int | bool = switch(...)(_1=(bytes, field(...)))
             raise TypeError(
                 f"Case field type {base_type} (for case '{key}') "
-                f"does not fit the switch() field type {meta.types}"
+                f"does not fit the switch() field type {field_types}"
             )
         base_meta = field_get_meta(base_field)
         base_field.name = field.name
         base_field.type = base_type
-        field_validate(base_field, base_meta)
+        if not base_meta.validated:
+            field_validate(base_field, base_meta)
         base_types.append(base_type)
-    if meta.types == type(Ellipsis) and type(Ellipsis) not in base_types:
+    if field_types is ELLIPSIS_TYPE and ELLIPSIS_TYPE not in base_types:
         raise TypeError(
             "Cannot use Ellipsis (...) for switch() fields without special fields"
         )
@@ -236,6 +267,7 @@ VALIDATORS = {
 
 
 def field_validate(field: Field, meta: FieldMeta) -> None:
+    # each field is validated once - the result is kept in its FieldMeta
     if meta.validated:
         return
     # decode field type
@@ -253,6 +285,12 @@ def field_validate(field: Field, meta: FieldMeta) -> None:
         meta.validated = True
         return
     valid_type = _validate_property_type_usage(meta)
-    if meta.ftype in VALIDATORS:
-        VALIDATORS[meta.ftype](field, meta, valid_type)
+    ftype = meta.ftype
+    if ftype is FieldType.FIELD:
+        # most common - field(), subfield(), built(), adapter()
+        _validate_field(field, meta, valid_type)
+    else:
+        validator = VALIDATORS.get(ftype)
+        if validator:
+            validator(field, meta, valid_type)
     meta.validated = True
@@ -1,5 +1,6 @@
 #  Copyright (c) Kuba Szczodrzyński 2024-10-11.
 
+import io
 import re
 from dataclasses import dataclass
 from pprint import pformat
@@ -10,6 +11,8 @@ import pytest
 from datastruct import DataStruct
 
 INPUT = b"\x00" * 256
+ENUM_REPR = re.compile(r"<([^.]+\.[^:]+?):.+?>")
+ENUM_ZERO = re.compile(r"([A-Za-z][A-Za-z0-9]+?)\.0")
 
 
 @dataclass
@@ -22,6 +25,27 @@ class OtherClass(DataStruct):
     pass
 
 
+class NonSeekableIO(io.RawIOBase):
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def readinto(self, b) -> int:
+        n = min(len(b), len(self.data) - self.pos)
+        b[:n] = self.data[self.pos : self.pos + n]
+        self.pos += n
+        return n
+
+    def tell(self) -> int:
+        return self.pos
+
+
 @dataclass
 class TestData:
     __test__ = False
@@ -54,23 +78,21 @@ class TestBase:
     def obj_to_str(self, obj: DataStruct) -> str:
         pp = pformat(obj)
         # fix enum representation
-        pp = re.sub(r"<([^.]+\.[^:]+?):.+?>", "\\1", pp)
-        pp = re.sub(r"([A-Za-z][A-Za-z0-9]+?)\.0", "\\1(0)", pp)
+        pp = ENUM_REPR.sub("\\1", pp)
+        pp = ENUM_ZERO.sub("\\1(0)", pp)
         return pp
 
     def bytes_to_hex_repr(self, data: bytes) -> str:
-        out = ""
-        for i in range(0, len(data), 16):
-            line = data[i : i + 16]
-            out += 'b"\\x' + line.hex(" ").replace(" ", "\\x") + '"\n'
-        return out
+        # 16 bytes per line, 4 chars per byte ("\\xAB")
+        full = data.hex(" ").replace(" ", "\\x")
+        return "".join(
+            'b"\\x' + full[i : i + 62] + '"\n' for i in range(0, len(full), 64)
+        )
 
     def bytes_to_hex_str(self, data: bytes) -> str:
-        out = ""
-        for i in range(0, len(data), 16):
-            line = data[i : i + 16]
-            out += line.hex(" ") + "\n"
-        return out
+        # 16 bytes per line, 3 chars per byte ("AB ")
+        full = data.hex(" ")
+        return "".join(full[i : i + 47] + "\n" for i in range(0, len(full), 48))
 
     def test_unpack_from_bytes(self) -> None:
         if self.test.data is None:
@@ -84,7 +106,7 @@ class TestBase:
             print()
             print(unpacked)
             print(self.test.obj_full)
-        assert unpacked == self.test.obj_full
+            assert unpacked == self.test.obj_full
 
     def test_pack_full_to_bytes(self) -> None:
         if self.test.obj_full is None:
@@ -95,10 +117,10 @@ class TestBase:
             print(self.bytes_to_hex_repr(packed))
             return
         if packed != self.test.data:
-            print()
-            print(packed.hex(" "))
-            print(self.test.data.hex(" "))
-        assert packed == self.test.data
+            # compare hex dumps for a line-by-line diff
+            packed_hex = self.bytes_to_hex_str(packed)
+            expected_hex = self.bytes_to_hex_str(self.test.data)
+            assert packed_hex == expected_hex
 
     def test_pack_simple_to_bytes(self) -> None:
         if self.test.obj_simple is None:
@@ -112,10 +134,10 @@ class TestBase:
             print(self.bytes_to_hex_repr(packed))
             return
         if packed != self.test.data:
-            print()
-            print(packed.hex(" "))
-            print(self.test.data.hex(" "))
-        assert packed == self.test.data
+            # compare hex dumps for a line-by-line diff
+            packed_hex = self.bytes_to_hex_str(packed)
+            expected_hex = self.bytes_to_hex_str(self.test.data)
+            assert packed_hex == expected_hex
 
     def test_full_after_packing(self) -> None:
         if (
@@ -129,7 +151,7 @@ class TestBase:
             print()
             print(self.test.obj_full)
             print(self.test.obj_simple)
-        assert self.test.obj_full == self.test.obj_simple
+            assert self.test.obj_full == self.test.obj_simple
 
     def test_unpack_then_pack(self) -> None:
         if not self.test.unpack_then_pack or self.test.data is None:
@@ -137,10 +159,10 @@ class TestBase:
         unpacked = self.get_cls().unpack(self.test.data, **self.test.context)
         packed = unpacked.pack(**self.test.context)
         if packed != self.test.data:
-            print()
-            print(packed.hex(" "))
-            print(self.test.data.hex(" "))
-        assert packed == self.test.data
+            # compare hex dumps for a line-by-line diff
+            packed_hex = self.bytes_to_hex_str(packed)
+            expected_hex = self.bytes_to_hex_str(self.test.data)
+            assert packed_hex == expected_hex
 
     def test_pack_then_unpack(self) -> None:
         if not self.test.pack_then_unpack or self.test.obj_full is None:
@@ -151,4 +173,4 @@ class TestBase:
             print()
             print(unpacked)
             print(self.test.obj_full)
-        assert unpacked == self.test.obj_full
+            assert unpacked == self.test.obj_full
@@ -1,5 +1,7 @@
 #  Copyright (c) Kuba Szczodrzyński 2024-10-11.
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from base import TestBase, TestData
 from test_ambz2_structs import *
@@ -25,7 +27,7 @@ def build_firmware():
     ota1_offset, _, ota1_end = board_flash["ota1"]
 
     # build the partition table
-    ptable = PartitionTable(user_data=b"\xFF" * 256)
+    ptable = PartitionTable(user_data=FF_256)
     for region, type in config.ptable.items():
         offset, length, _ = board_flash[region]
         hash_key = config.keys.hash_keys[region]
@@ -89,23 +91,33 @@ def build_firmware():
     )
 
 
-TEST_DATA = [
-    pytest.param(
-        TestData(
-            cls=Flash,
-            data=read_data_file(TEST_DATA_URLS["image_flash_is.bin"]),
-            obj_full=None,
-            obj_simple=build_firmware(),
-            context=dict(
-                hash_key=config.keys.hash_keys["part_table"],
-            ),
+def build_test_data() -> TestData:
+    # download all data files in parallel - later reads are served from cache
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(read_data_file, TEST_DATA_URLS.values()))
+    return TestData(
+        cls=Flash,
+        data=read_data_file(TEST_DATA_URLS["image_flash_is.bin"]),
+        obj_full=None,
+        obj_simple=build_firmware(),
+        context=dict(
+            hash_key=config.keys.hash_keys["part_table"],
         ),
-        id="dummy",
-    ),
+    )
+
+
+# build the test data only when the tests run, once per session
+@pytest.fixture(scope="session", name="test")
+def ambz2_test_data(request: pytest.FixtureRequest) -> TestData:
+    return request.param()
+
+
+TEST_DATA = [
+    pytest.param(build_test_data, id="dummy"),
 ]
 
 
-@pytest.mark.parametrize("test", TEST_DATA)
+@pytest.mark.parametrize("test", TEST_DATA, indirect=True)
 class TestAmbZ2(TestBase):
     pass
 
@@ -3,9 +3,11 @@
 
 from dataclasses import dataclass
 from enum import Enum, IntEnum, IntFlag
+from functools import lru_cache
 from hashlib import sha256
 from hmac import HMAC
-from typing import Any, Callable, Dict, Iterable, List, Optional, Type, TypeVar
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Type
 
 from util import read_data_file
 
@@ -41,20 +43,37 @@ TEST_DATA_URLS = {
 
 FLASH_CALIBRATION = b"\x99\x99\x96\x96\x3F\xCC\x66\xFC\xC0\x33\xCC\x03\xE5\xDC\x31\x62"
 
+FF_256 = b"\xFF" * 256
 FF_48 = b"\xFF" * 48
 FF_32 = b"\xFF" * 32
 FF_16 = b"\xFF" * 16
 
-T = TypeVar("T")
+
+@lru_cache()
+def _hmac_sha256_base(key: bytes) -> HMAC:
+    return HMAC(key, digestmod=sha256)
+
+
+def hmac_sha256(key: bytes, msg: bytes = b"") -> HMAC:
+    # copy a keyed HMAC instead of deriving the key pads again
+    hmac = _hmac_sha256_base(key).copy()
+    hmac.update(msg)
+    return hmac
+
+
+@lru_cache()
+def _enum_by_name(cls: Type[Enum]) -> Dict[str, Enum]:
+    # if two members differ only in case, the first one wins
+    names = {}
+    for e in cls:
+        names.setdefault(e.name.lower(), e)
+    return names
 
 
 def str2enum(cls: Type[Enum], key: str):
     if not key:
         return None
-    try:
-        return next(e for e in cls if e.name.lower() == key.lower())
-    except StopIteration:
-        return None
+    return _enum_by_name(cls).get(key.lower())
 
 
 class FlashSpeed(IntEnum):
@@ -176,13 +195,6 @@ class HashAlgo(IntEnum):
     OTHER = 0xFF
 
 
-def index(func: Callable[[T], int], iterable: Iterable[T], default: T = None) -> T:
-    for idx, item in enumerate(iterable):
-        if func(item):
-            return idx
-    return default
-
-
 class BitFlag(Adapter):
     def encode(self, value: bool, ctx: Context) -> int:
         return 0xFF if value else 0xFE
@@ -191,9 +203,11 @@ class BitFlag(Adapter):
         return value & 1 == 1
 
 
+_get_next_offset = attrgetter("P.item.header.next_offset")
+
+
 def header_is_last(ctx: Context) -> bool:
-    header: SectionHeader = ctx.P.item.header
-    return header.next_offset == 0xFFFFFFFF
+    return _get_next_offset(ctx) == 0xFFFFFFFF
 
 
 @dataclass
@@ -301,8 +315,18 @@ class PartitionRecord(DataStruct):
     hash_key: bytes = field("32s", default=FF_32)
 
 
+def get_partition_indexes(ctx: Context) -> Dict[PartitionType, int]:
+    # map partition types to their first index, once per packing context
+    if ctx.partition_indexes is None:
+        indexes = {}
+        for idx, partition in enumerate(ctx.partitions):
+            indexes.setdefault(partition.type, idx)
+        ctx.partition_indexes = indexes
+    return ctx.partition_indexes
+
+
 def find_partition_index(type: PartitionType):
-    return lambda ctx: index(lambda p: p.type == type, ctx.partitions, 255)
+    return lambda ctx: get_partition_indexes(ctx).get(type, 255)
 
 
 @dataclass
@@ -389,19 +413,13 @@ class Image(DataStruct):
             # calculate OTA signature (header hash)
             header = image.header.pack(parent=image)
             if ctx.hash_key:
-                image.ota_signature = HMAC(
-                    key=ctx.hash_key,
-                    msg=header,
-                    digestmod=sha256,
-                ).digest()
+                image.ota_signature = hmac_sha256(ctx.hash_key, header).digest()
             else:
                 image.ota_signature = sha256(header).digest()
 
     _0: ... = action(packing(update))
     _hash: ... = checksum_start(
-        init=lambda ctx: (
-            HMAC(ctx.hash_key, digestmod=sha256) if ctx.hash_key else sha256()
-        ),
+        init=lambda ctx: (hmac_sha256(ctx.hash_key) if ctx.hash_key else sha256()),
         update=lambda data, obj, ctx: obj.update(data),
         end=lambda obj, ctx: obj.digest(),
     )
@@ -559,9 +577,9 @@ class ImageConfig:
 
 def pad_data(data: bytes, n: int, char: int) -> bytes:
     """Add 'char'-filled padding to 'data' to align to a 'n'-sized block."""
-    if len(data) % n == 0:
-        return data
-    return data + (bytes([char]) * pad_up(len(data), n))
+    length = len(data) + pad_up(len(data), n)
+    # ljust() builds the result in one allocation (returns 'data' if aligned)
+    return data.ljust(length, bytes([char]))
 
 
 def get_image_config():
@@ -629,6 +647,7 @@ def get_image_config():
     return ImageConfig(**image)
 
 
+@lru_cache()
 def get_public_key(private: bytes) -> bytes:
     return bytes.fromhex(
         {
@@ -101,7 +101,7 @@ class TlsExtension(DataStruct):
 
     type: int = field("H")
     length: int = field("H")
-    data: bytes | ServerName = switch(lambda ctx: bool(ctx.length) and ctx.type)(
+    data: bytes | ServerName = switch(lambda ctx: ctx.type if ctx.length else None)(
         _0=(ServerName, subfield()),
         default=(bytes, field(lambda ctx: ctx.length)),
     )
@@ -1,17 +1,27 @@
 #  Copyright (c) Kuba Szczodrzyński 2024-10-13.
 
+import io
+import struct
 from dataclasses import dataclass
-from typing import Any
+from enum import IntEnum
+from typing import Any, Callable, Type
+from unittest import mock
 
 import pytest
-from base import INPUT, DummyClass
+from base import INPUT, DummyClass, NonSeekableIO
 
-from datastruct import DataStruct
+from datastruct import BIG, DataStruct, datastruct
+from datastruct.adapters.network import mac_field
 from datastruct.fields import (
+    adapter,
     built,
     cond,
     const,
+    crypt,
+    crypt_end,
     field,
+    hook,
+    hook_end,
     padding,
     repeat,
     skip,
@@ -20,6 +30,30 @@ from datastruct.fields import (
 )
 
 
+class DummyEnum(IntEnum):
+    A = 1
+    B = 2
+
+
+def per_field(cls: Type[DataStruct]):
+    # disable the combined struct.Struct, to compare with the standard path
+    return mock.patch.object(cls, "_static_layout", return_value=None)
+
+
+def per_item(cls: Type[DataStruct]):
+    # disable reading repeats at once, to compare with the standard path
+    return mock.patch.object(cls, "_read_repeat_static", return_value=None)
+
+
+def assert_same_error(cls: Type[DataStruct], func: Callable) -> None:
+    with pytest.raises(Exception) as static:
+        func()
+    with per_field(cls), per_item(cls), pytest.raises(Exception) as standard:
+        func()
+    assert type(static.value) is type(standard.value)
+    assert str(static.value) == str(standard.value)
+
+
 class TestValidationPass:
     def test_simple(self):
         @dataclass
@@ -70,6 +104,44 @@ class TestValidationPass:
         assert type(obj.var1[0]) == list
         assert type(obj.var1[0][0]) == int
 
+    def test_adapter_default(self):
+        from macaddress import MAC
+
+        @dataclass
+        class TestClass(DataStruct):
+            var1: MAC = mac_field(default="00-11-22-33-44-55")
+
+        obj = TestClass()
+        assert obj.var1 == MAC("00-11-22-33-44-55")
+        assert obj.pack() == b"\x00\x11\x22\x33\x44\x55"
+
+    def test_padding_crypt(self):
+        @dataclass
+        class TestClass(DataStruct):
+            _crypt: ... = crypt(
+                block_size=1,
+                init=lambda ctx: None,
+                decrypt=lambda data, obj, ctx: data,
+                encrypt=lambda data, obj, ctx: data,
+            )
+            var1: int = field("H")
+            _1: ... = padding(2)
+            var2: int = field("H")
+            _end: ... = crypt_end(_crypt)
+
+        obj = TestClass.unpack(b"\x01\x00\x00\x00\x02\x00")
+        assert obj == TestClass(var1=1, var2=2)
+
+    def test_padding_non_seekable(self):
+        @dataclass
+        class TestClass(DataStruct):
+            var1: int = field("H")
+            _1: ... = padding(2)
+            var2: int = field("H")
+
+        stream = io.BufferedReader(NonSeekableIO(b"\x01\x00\x00\x00\x02\x00"))
+        assert TestClass.unpack(stream) == TestClass(var1=1, var2=2)
+
 
 class TestValidationFail:
     def test_simple(self):
@@ -101,7 +173,15 @@ class TestValidationFail:
         class TestClass7(DataStruct):
             var: int | float | bytes = field("I")
 
-        for cls in (TestClass1, TestClass2):
+        @dataclass
+        class TestClass8(DataStruct):
+            var: object = field("I")
+
+        @dataclass
+        class TestClass9(DataStruct):
+            var: "int" = field("I")
+
+        for cls in (TestClass1, TestClass2, TestClass8):
             with pytest.raises(
                 TypeError,
                 match="Cannot use .*",
@@ -138,6 +218,12 @@ class TestValidationFail:
         ):
             TestClass7.unpack(INPUT)
 
+        with pytest.raises(
+            TypeError,
+            match="Field type must be a class",
+        ):
+            TestClass9.unpack(INPUT)
+
     def test_special(self):
         @dataclass
         class TestClass1(DataStruct):
@@ -218,3 +304,250 @@ class TestValidationFail:
             match="Built fields inside repeat.* are always built",
         ):
             TestClass6.unpack(INPUT)
+
+
+class TestStaticLayout:
+    def test_unpack(self):
+        @dataclass
+        class TestClass(DataStruct):
+            var1: int = field("H")
+            var2: bytes = field(3)
+            var3: DummyEnum = field("B")
+            var4: bool = field("?")
+            var5: int = field("i")
+
+        data = b"\x01\x02abc\x02\x01\xff\xff\xff\xff"
+        assert TestClass._static_layout() is not None
+        obj = TestClass.unpack(data)
+        assert obj == TestClass(
+            var1=0x0201,
+            var2=b"abc",
+            var3=DummyEnum.B,
+            var4=True,
+            var5=-1,
+        )
+        with per_field(TestClass):
+            assert TestClass.unpack(data) == obj
+
+    def test_unpack_short(self):
+        @dataclass
+        class TestClass(DataStruct):
+            var1: int = field("H")
+            var2: bytes = field(3)
+            var3: int = field("I")
+
+        data = b"\x01\x02abc\x03\x04\x05\x06"
+        for i in range(len(data)):
+            assert_same_error(TestClass, lambda: TestClass.unpack(data[:i]))
+
+    def test_unpack_enum_error(self):
+        @dataclass
+        class TestClass(DataStruct):
+            var1: int = field("H")
+            var2: DummyEnum = field("B")
+
+        assert_same_error(TestClass, lambda: TestClass.unpack(b"\x01\x00\x07"))
+
+    def test_adapter_tell(self):
+        tell_adapter = adapter(
+            encode=lambda value, ctx: ctx.P.tell(),
+            decode=lambda value, ctx: ctx.P.tell(),
+        )
+
+        @dataclass
+        class TestClass(DataStruct):
+            var1: int = tell_adapter(field("H", default=0))
+            var2: int = tell_adapter(field("H", default=0))
+            var3: int = tell_adapter(field("H", default=0))
+
+        assert TestClass._static_layout() is None
+        assert TestClass().pack() == b"\x00\x00\x02\x00\x04\x00"
+        assert TestClass.unpack(bytes(6)) == TestClass(var1=2, var2=4, var3=6)
+
+    def test_decode_error_crypt(self):
+        @dataclass
+        class Inner(DataStruct):
+            var1: int = field("H")
+            var2: DummyEnum = field("B")
+
+        @dataclass
+        class TestClass(DataStruct):
+            _crypt: ... = crypt(
+                block_size=1,
+                init=lambda ctx: None,
+                decrypt=lambda data, obj, ctx: data,
+                encrypt=lambda data, obj, ctx: data,
+            )
+            inner: Inner = subfield()
+            _end: ... = crypt_end(_crypt)
+
+        with pytest.raises(ValueError, match="while unpacking 'Inner.var2'"):
+            TestClass.unpack(b"\x01\x00\x07")
+        with pytest.raises(struct.error, match="while unpacking 'Inner.var2'"):
+            Inner.unpack(b"\x01\x00")
+
+    def test_pack(self):
+        @dataclass
+        class TestClass(DataStruct):
+            var1: int = field("H")
+            var2: bytes = field(3)
+            var3: DummyEnum = field("B")
+            var4: bool = field("?")
+            var5: int = field("i")
+
+        obj = TestClass(var1=0x0201, var2=b"abcd", var3=DummyEnum.B, var4=True, var5=-1)
+        assert TestClass._static_layout() is not None
+        with mock.patch.object(DataStruct, "_write_field") as write_field:
+            data = obj.pack()
+            write_field.assert_not_called()
+        assert data == b"\x01\x02abc\x02\x01\xff\xff\xff\xff"
+        with per_field(TestClass):
+            assert obj.pack() == data
+
+    def test_pack_fallback(self):
+        @dataclass
+        class TestClass(DataStruct):
+            var1: int = field("B")
+            var2: bytes = field(3)
+
+        assert TestClass._static_layout() is not None
+        for var1, var2 in [
+            (1, b"ab"),
+            (1, "abc"),
+            (256, b"abc"),
+            (-1, b"abc"),
+            ("1", b"abc"),
+        ]:
+            obj = TestClass(var1=0, var2=b"abc")
+            # bypass the type checks of __post_init__()
+            obj.var1, obj.var2 = var1, var2
+            assert_same_error(TestClass, obj.pack)
+
+    def test_pack_sizing(self):
+        @dataclass
+        class TestClass(DataStruct):
+            var1: int = field("H")
+            var2: bytes = field(3)
+            var3: int = field("Q")
+
+        packer, _, _ = TestClass._static_layout()
+        # values aren't checked when sizing, in either path
+        obj = TestClass(var1=-1, var2=b"", var3=0)
+        assert obj.sizeof() == packer.size == 13
+        with per_field(TestClass):
+            assert obj.sizeof() == 13
+
+    def test_pack_hooks(self):
+        @dataclass
+        class Inner(DataStruct):
+            var1: int = field("H")
+            var2: int = field("H")
+
+        chunks = []
+
+        @dataclass
+        class TestClass(DataStruct):
+            _hook: ... = hook(
+                update=lambda value, ctx: chunks.append(value),
+                io_level=False,
+            )
+            inner: Inner = subfield()
+            _end: ... = hook_end(_hook)
+
+        obj = TestClass(inner=Inner(var1=1, var2=2))
+        assert Inner._static_layout() is not None
+        # hooks must see each field separately
+        assert obj.pack() == b"\x01\x00\x02\x00"
+        assert chunks == [b"\x01\x00", b"\x02\x00"]
+        chunks.clear()
+        assert TestClass.unpack(b"\x01\x00\x02\x00") == obj
+        assert chunks == [b"\x01\x00", b"\x02\x00"]
+
+    def test_pack_endianness(self):
+        @dataclass
+        class TestClass(DataStruct):
+            var1: int = field("<H")
+            var2: int = field(">H")
+            var3: int = field("H")
+
+        @datastruct(endianness=BIG)
+        @dataclass
+        class TestClassBig(DataStruct):
+            var1: int = field("H")
+            var2: int = field("<H")
+
+        @dataclass
+        class TestClassSame(DataStruct):
+            var1: int = field(">H")
+            var2: int = field(">I")
+
+        # mixing byte orders can't be done with a single struct.Struct
+        assert TestClass._static_layout() is None
+        assert TestClassBig._static_layout() is None
+        obj = TestClass(var1=1, var2=2, var3=3)
+        assert obj.pack() == b"\x01\x00\x00\x02\x03\x00"
+        assert TestClass.unpack(b"\x01\x00\x00\x02\x03\x00") == obj
+        obj = TestClassBig(var1=1, var2=2)
+        assert obj.pack() == b"\x00\x01\x02\x00"
+        assert TestClassBig.unpack(b"\x00\x01\x02\x00") == obj
+        # a consistent explicit byte order is kept in the combined struct
+        assert TestClassSame._static_layout() is not None
+        obj = TestClassSame(var1=1, var2=2)
+        assert obj.pack() == b"\x00\x01\x00\x00\x00\x02"
+        assert TestClassSame.unpack(b"\x00\x01\x00\x00\x00\x02") == obj
+
+
+class TestStaticRepeat:
+    def test_repeat(self):
+        @dataclass
+        class TestClass(DataStruct):
+            var1: list[int] = repeat(3)(field("H"))
+            var2: list[DummyEnum] = repeat(3)(field("B"))
+            var3: list[list[int]] = repeat(2)(repeat(2)(field(">h")))
+
+        data = b"\x01\x00\x02\x00\x03\x00\x01\x02\x01\x00\x01\xff\xff\x00\x02\xff\xfe"
+        with mock.patch.object(
+            TestClass,
+            "_read_repeat_static",
+            wraps=TestClass._read_repeat_static,
+        ) as read_repeat_static:
+            obj = TestClass.unpack(data)
+            # var1, var2, var3 and its items (the outer repeat falls back)
+            assert read_repeat_static.call_count == 5
+        assert obj == TestClass(
+            var1=[1, 2, 3],
+            var2=[DummyEnum.A, DummyEnum.B, DummyEnum.A],
+            var3=[[1, -1], [2, -2]],
+        )
+        assert type(obj.var2[0]) is DummyEnum
+        with per_item(TestClass):
+            assert TestClass.unpack(data) == obj
+
+    def test_repeat_fallback(self):
+        @dataclass
+        class TestClass(DataStruct):
+            var1: list[int] = repeat(4, when=lambda ctx: ctx.P.i < 2)(field("B"))
+            var2: list[int] = repeat(4, last=lambda ctx: ctx.P.item == 0)(field("B"))
+            var3: list[int] = repeat(4, length=2)(field("B"))
+            var4: list[int] = repeat(0)(field("B"))
+
+        with mock.patch.object(TestClass, "_read_repeat_static") as read_repeat_static:
+            obj = TestClass.unpack(b"\x01\x02\x03\x00\x04\x05")
+            read_repeat_static.assert_not_called()
+        assert obj == TestClass(var1=[1, 2], var2=[3, 0], var3=[4, 5], var4=[])
+
+    def test_repeat_short(self):
+        @dataclass
+        class TestClass(DataStruct):
+            var1: list[int] = repeat(3)(field("H"))
+
+        @dataclass
+        class TestClassEnum(DataStruct):
+            var1: list[DummyEnum] = repeat(3)(field("H"))
+
+        data = b"\x01\x00\x02\x00\x01\x00"
+        for i in range(len(data)):
+            assert_same_error(TestClass, lambda: TestClass.unpack(data[:i]))
+        data = b"\x01\x00\x07\x00\x01\x00"
+        for i in range(len(data) + 1):
+            assert_same_error(TestClassEnum, lambda: TestClassEnum.unpack(data[:i]))
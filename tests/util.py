@@ -1,22 +1,65 @@
 #  Copyright (c) Kuba Szczodrzyński 2024-10-12.
 
+import gzip
+from functools import lru_cache
+from hashlib import sha1
+from pathlib import Path
+from tempfile import NamedTemporaryFile, gettempdir
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# reuse connections when downloading multiple files (also from threads),
+# retrying on connection errors and server failures
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+    pool_maxsize=16,
+)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+
+def _download(url: str, path: Path) -> None:
+    with _session.get(url, stream=True, timeout=30) as r:
+        r.raise_for_status()
+        # write atomically, so that interrupted or parallel runs
+        # don't leave partial files
+        with NamedTemporaryFile(
+            dir=path.parent,
+            prefix=f"{path.name}.",
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            temp = Path(f.name)
+            try:
+                for chunk in r.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+            except BaseException:
+                f.close()
+                temp.unlink()
+                raise
+    temp.replace(path)
+
+
+@lru_cache(maxsize=None)
 def read_data_file(name_or_url: str, gzipped: bool = False) -> bytes:
     if name_or_url.startswith("http"):
-        import requests
-
-        print(f"Downloading data from '{name_or_url}'")
-        with requests.get(name_or_url) as r:
-            data = r.content
+        # keep downloaded files between test runs
+        url_hash = sha1(name_or_url.encode()).hexdigest()
+        path = Path(gettempdir()) / f"datastruct-{url_hash}"
+        if path.is_file():
+            print(f"Reading data from '{name_or_url}' (cached)")
+        else:
+            print(f"Downloading data from '{name_or_url}'")
+            _download(name_or_url, path)
     else:
-        from pathlib import Path
-
         print(f"Reading data from '{name_or_url}'")
         path = Path(__file__).with_name(name_or_url)
-        data = path.read_bytes()
 
     if gzipped:
-        import gzip
-
-        return gzip.decompress(data)
-    return data
+        # decompress while reading, without keeping the compressed data in memory
+        with gzip.open(path, "rb") as f:
+            return f.read()
+    return path.read_bytes()